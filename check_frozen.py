@@ -0,0 +1,54 @@
+import random
+from bisect import bisect_left
+from frozen import FrozenIndex
+from dsw import BinaryTree
+from skiplist import SkipList
+
+# Function to check every lookup of a FrozenIndex against bisect on the sorted keys
+def check_against_bisect(keys, queries, layout):
+    keys = sorted(keys)
+    frozen = FrozenIndex(keys, layout=layout)
+    stored = set(keys)
+    assert len(frozen) == len(keys)
+    assert frozen.to_list() == keys
+
+    values, valid = frozen.lower_bound_many(queries)
+    found = frozen.search_many(queries)
+    for query, value, ok, hit in zip(queries, values.tolist(), valid.tolist(), found.tolist()):
+        i = bisect_left(keys, query)
+        expected = keys[i] if i < len(keys) else None
+        assert frozen.lower_bound(query) == expected
+        assert ok == (expected is not None)
+        if ok:
+            assert value == expected
+        assert hit == (query in stored)
+        assert (frozen.search(query) is not None) == (query in stored)
+
+# Function to check that freeze() is cached until the next write
+def check_freeze_cache(structure):
+    keys = [random.randint(1, 1000) for _ in range(200)]
+    for key in keys:
+        structure.insert(key)
+    frozen = structure.freeze()
+    assert structure.freeze() is frozen
+    assert frozen.to_list() == sorted(keys)
+    structure.delete(keys[0])
+    assert structure.frozen is None
+    assert structure.freeze(layout="veb").to_list() == sorted(keys[1:])
+
+
+if __name__ == "__main__":
+    random.seed(0)
+    for trial in range(500):
+        size = random.choice([0, 1, 2, 3, random.randint(4, 64), random.randint(65, 3000)])
+        if trial % 2:
+            keys = [random.uniform(-100, 100) for _ in range(size)]
+            queries = [random.uniform(-110, 110) for _ in range(100)] + keys[:20]
+        else:
+            keys = [random.randint(-50, 50) for _ in range(size)]  # Plenty of duplicates
+            queries = list(range(-55, 56))
+        for layout in FrozenIndex.LAYOUTS:
+            check_against_bisect(keys, queries, layout)
+    check_freeze_cache(BinaryTree())
+    check_freeze_cache(SkipList(max_level=4, p=0.5))
+    print("All frozen index checks passed")
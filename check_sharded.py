@@ -0,0 +1,121 @@
+import random
+from sharded import ShardedIndex
+
+
+class FailingKey(int):
+    """Key that compares like an int until it has crossed a pipe fail_from times.
+
+    Every pickling counts one crossing, so an odd count means the key is inside a
+    shard worker. Comparisons there raise once the count reaches fail_from.
+    """
+
+    def __new__(cls, value, fail_from, crossings=0):
+        key = int.__new__(cls, value)
+        key.fail_from = fail_from
+        key.crossings = crossings
+        return key
+
+    def __reduce__(self):
+        return (FailingKey, (int(self), self.fail_from, self.crossings + 1))
+
+    def _check(self):
+        if self.crossings % 2 == 1 and self.crossings >= self.fail_from:
+            raise ValueError("comparison inside a shard worker")
+
+    def __lt__(self, other):
+        self._check()
+        return int(self) < other
+
+    def __gt__(self, other):
+        self._check()
+        return int(self) > other
+
+# Function to check routing, range search and shard sizes against a sorted list
+def check_against_sorted(structure, num_shards):
+    keys = [random.randint(1, 10000) for _ in range(1500)]
+    with ShardedIndex(num_shards, structure=structure, rebalance_threshold=2.0) as index:
+        index.insert_many(keys[:1000])
+        for key in keys[1000:]:
+            index.insert(key)
+        for key in keys[:100]:
+            index.delete(key)
+        expected = sorted(keys[100:])
+
+        assert index.range_search(0, 20000) == expected
+        assert index.range_search(2500, 7500) == [key for key in expected if 2500 <= key <= 7500]
+        assert index.search_many(expected[:50]) == expected[:50]
+        assert index.size() == len(expected)
+        for shard in range(num_shards):
+            low = index.boundaries[shard - 1] if shard > 0 else float("-inf")
+            high = index.boundaries[shard] if shard < num_shards - 1 else float("inf")
+            assert index.sizes[shard] == sum(1 for key in expected if low <= key < high)
+
+# Function to check that a failing shard does not leave stale replies in the other pipes
+def check_error_does_not_desync(structure):
+    with ShardedIndex(2, structure=structure) as index:
+        try:
+            # Shard 0 fails on its third key (before inserting anything for dsw, which sorts first);
+            # shard 1 inserts both of its keys
+            index.insert_many([1, 2, FailingKey(3, fail_from=1), 5001, 5002])
+        except ValueError:
+            pass
+        else:
+            raise AssertionError("expected a ValueError from shard 0")
+        assert index.search(5001) == 5001
+        assert index.search(5002) == 5002
+        assert index.sizes == [len(index.range_search(0, 5000)), 2]
+
+# Function to check that sorted batches do not degenerate a dsw shard into a chain
+def check_sorted_batches_into_dsw():
+    with ShardedIndex(2, structure="dsw") as index:
+        for start in range(1, 9000, 3000):
+            index.insert_many(range(start, start + 3000))
+        assert index.range_search(0, 20000) == list(range(1, 9001))
+        assert index.search(8999) == 8999
+        assert index.rebalance(1.1)
+        assert index.sizes == [4500, 4500]
+
+# Function to check when rebalance fires and that unfixable skew does not rebuild on every insert
+def check_rebalance():
+    with ShardedIndex(2, structure="skiplist", key_range=(1, 10000)) as index:
+        index.insert_many(range(1, 200))
+        assert index.sizes == [199, 0]
+        assert index.rebalance()
+        assert max(index.sizes) - min(index.sizes) <= 1
+        assert index.range_search(0, 20000) == list(range(1, 200))
+
+    with ShardedIndex(4, structure="skiplist", key_range=(1, 10000), rebalance_threshold=2.0) as index:
+        attempts = []
+        rebalance = index.rebalance
+        index.rebalance = lambda threshold: attempts.append(rebalance(threshold))
+        for _ in range(300):
+            index.insert(7)
+        assert index.sizes == [300, 0, 0, 0]
+        assert not any(attempts)
+        assert len(attempts) < 20
+
+    with ShardedIndex(2, structure="skiplist", key_range=(1, 10000)) as index:
+        # The failing key reaches shard 1's load on its third crossing, after the gather
+        keys = list(range(5001, 5200))
+        index.insert_many(keys[:149] + [FailingKey(5150, fail_from=3)] + keys[150:])
+        try:
+            index.rebalance()
+        except ValueError:
+            pass
+        else:
+            raise AssertionError("expected a ValueError from shard 1's load")
+        assert index.boundaries == [5001]
+        assert index.sizes == [0, 199]
+        assert index.range_search(0, 20000) == keys
+
+
+if __name__ == "__main__":
+    random.seed(0)
+    for structure in ("skiplist", "dsw"):
+        for num_shards in (1, 2, 3, 4):
+            check_against_sorted(structure, num_shards)
+    for structure in ("skiplist", "dsw"):
+        check_error_does_not_desync(structure)
+    check_sorted_batches_into_dsw()
+    check_rebalance()
+    print("All sharded index checks passed")
@@ -1,5 +1,6 @@
 import graphviz
 import numpy as np  
+from frozen import FrozenIndex
 
 class TreeNode:
     def __init__(self, value):
@@ -12,8 +13,10 @@ class TreeNode:
 class BinaryTree:
     def __init__(self):
         self.root = None
+        self.frozen = None  # Cached FrozenIndex, dropped on the next write
 
     def insert(self, value):
+        self.frozen = None
         if not self.root:
             self.root = TreeNode(value)
         else:
@@ -45,6 +48,7 @@ class BinaryTree:
             return self._search_rec(node.children[1], value)
         
     def delete(self, value):
+        self.frozen = None
         self.root = self._delete_rec(self.root, value)
 
     def _delete_rec(self, node, value):
@@ -155,13 +159,36 @@ class BinaryTree:
         parent.children[1].children[0] = child
 
     def get_size(self):
-        def count_nodes(node):
-            if not node:
-                return 0
-            return 1 + count_nodes(node.children[0]) + count_nodes(node.children[1])
-
-        return count_nodes(self.root)
+        # Iterative so it also works on the backbone, which is as deep as the tree is large
+        count = 0
+        stack = [self.root] if self.root else []
+        while stack:
+            node = stack.pop()
+            count += 1
+            for child in node.children:
+                if child:
+                    stack.append(child)
+        return count
     
+    def inorder(self):
+        keys = []
+        stack = []
+        node = self.root
+        while stack or node:
+            while node:
+                stack.append(node)
+                node = node.children[0]
+            node = stack.pop()
+            keys.append(node.value)
+            node = node.children[1]
+        return keys
+
+    def freeze(self, layout="eytzinger"):
+        # Read-only array layout for lookup-heavy phases; rebuilt after any insert or delete
+        if self.frozen is None or self.frozen.layout != layout:
+            self.frozen = FrozenIndex(self.inorder(), layout=layout)
+        return self.frozen
+
     def range_search(self, low, high):
         results = []
         self._range_search_rec(self.root, low, high, results)
@@ -197,3 +224,7 @@ if __name__ == "__main__":
     print("Balanced Tree Visualization:")
     balanced_dot = tree.generate_graphviz()
     balanced_dot.render("balanced_tree", format="png", cleanup=True)
+
+    frozen = tree.freeze(layout="eytzinger")
+    print("Frozen Eytzinger layout:", frozen.values.tolist())
+    print("Lower bound of 4:", frozen.lower_bound(4))
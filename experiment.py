@@ -3,6 +3,8 @@ import tracemalloc
 import matplotlib.pyplot as plt
 from skiplist import SkipList
 from dsw import BinaryTree
+from sharded import ShardedIndex, initial_boundaries, make_structure
+from bisect import bisect_right
 import os
 
 # Function to load dataset
@@ -146,6 +148,147 @@ def run_range_search_experiment(dataset_sizes):
 
     return range_search_times_skiplist, range_search_times_dsw, memory_usage_range_search_skiplist, memory_usage_range_search_dsw
 
+# Running the frozen layout experiment: batch lookups and footprint after freezing
+def run_frozen_search_experiment(dataset_sizes):
+    search_times_skiplist = []
+    search_times_dsw = []
+    search_times_eytzinger = []
+    search_times_veb = []
+    single_search_times_eytzinger = []
+    single_search_times_veb = []
+    footprint_skiplist = []
+    footprint_dsw = []
+    footprint_eytzinger = []
+    footprint_veb = []
+
+    for size in dataset_sizes:
+        dataset = load_dataset(f"datasets/dataset_{size}.txt")
+
+        # Footprint of each structure, measured as memory still held after building it
+        tracemalloc.start()
+        skiplist = SkipList(max_level=4, p=0.5)
+        for value in dataset:
+            skiplist.insert(value)
+        footprint_skiplist.append(tracemalloc.get_traced_memory()[0])
+        tracemalloc.stop()
+
+        tracemalloc.start()
+        tree = BinaryTree()
+        for value in dataset:
+            tree.insert(value)
+        footprint_dsw.append(tracemalloc.get_traced_memory()[0])
+        tracemalloc.stop()
+
+        # Balance the tree with DSW (without rendering images) so the frozen layouts are compared to its best case
+        tree.create_backbone()
+        tree.balance_tree()
+
+        # Footprint of each frozen layout, measured the same way, across building it and a first lookup
+        tracemalloc.start()
+        eytzinger = tree.freeze(layout="eytzinger")
+        eytzinger.search(dataset[0])
+        footprint_eytzinger.append(tracemalloc.get_traced_memory()[0])
+        tracemalloc.stop()
+
+        tracemalloc.start()
+        veb = tree.freeze(layout="veb")
+        veb.search(dataset[0])
+        footprint_veb.append(tracemalloc.get_traced_memory()[0])
+        tracemalloc.stop()
+
+        # Look up every key of the dataset
+        search_times_skiplist.append(measure_time(lambda: [skiplist.search(value) for value in dataset]))
+        search_times_dsw.append(measure_time(lambda: [tree.search(value) for value in dataset]))
+        search_times_eytzinger.append(measure_time(eytzinger.search_many, dataset))
+        single_search_times_eytzinger.append(measure_time(lambda: [eytzinger.search(value) for value in dataset]))
+        search_times_veb.append(measure_time(veb.search_many, dataset))
+        single_search_times_veb.append(measure_time(lambda: [veb.search(value) for value in dataset]))
+
+    return (search_times_skiplist, search_times_dsw, search_times_eytzinger, search_times_veb,
+            single_search_times_eytzinger, single_search_times_veb,
+            footprint_skiplist, footprint_dsw, footprint_eytzinger, footprint_veb)
+
+# Plotting the frozen layout results
+def plot_frozen_results(dataset_sizes, search_times_skiplist, search_times_dsw, search_times_eytzinger,
+                        search_times_veb, single_search_times_eytzinger, single_search_times_veb,
+                        footprint_skiplist, footprint_dsw, footprint_eytzinger, footprint_veb):
+    if not os.path.exists('results'):
+        os.makedirs('results')
+    plt.figure(figsize=(10, 6))
+    plt.plot(dataset_sizes, search_times_skiplist, label="SkipList Search Time", color='green')
+    plt.plot(dataset_sizes, search_times_dsw, label="Balanced DSW Tree Search Time", color='orange')
+    plt.plot(dataset_sizes, search_times_eytzinger, label="Frozen Eytzinger search_many Time", color='blue')
+    plt.plot(dataset_sizes, search_times_veb, label="Frozen van Emde Boas search_many Time", color='red')
+    plt.plot(dataset_sizes, single_search_times_eytzinger, label="Frozen Eytzinger search Time", color='blue', linestyle='--')
+    plt.plot(dataset_sizes, single_search_times_veb, label="Frozen van Emde Boas search Time", color='red', linestyle='--')
+    plt.xlabel('Dataset Size')
+    plt.ylabel('Time (seconds)')
+    plt.title('Lookup of Every Key: Pointer Structures vs Frozen Layouts')
+    plt.legend()
+    plt.grid(True)
+    plt.savefig('results/frozen_search_times.png')
+    plt.show()
+
+    plt.figure(figsize=(10, 6))
+    plt.plot(dataset_sizes, footprint_skiplist, label="SkipList Footprint", color='green')
+    plt.plot(dataset_sizes, footprint_dsw, label="DSW Tree Footprint", color='orange')
+    plt.plot(dataset_sizes, footprint_eytzinger, label="Frozen Eytzinger Footprint", color='blue')
+    plt.plot(dataset_sizes, footprint_veb, label="Frozen van Emde Boas Footprint", color='red')
+    plt.xlabel('Dataset Size')
+    plt.ylabel('Memory Usage (bytes)')
+    plt.title('Footprint: Pointer Structures vs Frozen Layouts')
+    plt.legend()
+    plt.grid(True)
+    plt.savefig('results/frozen_footprint.png')
+    plt.show()
+
+# Function to insert then search a dataset over the same key-range partition as ShardedIndex,
+# but with every partition in this process. Separates the smaller-structure effect from parallelism.
+def run_partitioned_in_process(dataset, num_shards, structure):
+    boundaries = initial_boundaries(num_shards, (1, 10000))
+    partitions = [make_structure(structure) for _ in range(num_shards)]
+    for value in dataset:
+        partitions[bisect_right(boundaries, value)].insert(value)
+    return [partitions[bisect_right(boundaries, value)].search(value) for value in dataset]
+
+# Running the sharding experiment: throughput of batched operations per shard count
+def run_sharding_experiment(shard_counts, size=8000):
+    dataset = load_dataset(f"datasets/dataset_{size}.txt")
+    throughput_skiplist = []
+    throughput_dsw = []
+    baseline_skiplist = []
+    baseline_dsw = []
+
+    for num_shards in shard_counts:
+        for structure, throughputs, baseline in (("skiplist", throughput_skiplist, baseline_skiplist),
+                                                 ("dsw", throughput_dsw, baseline_dsw)):
+            with ShardedIndex(num_shards, structure=structure) as index:
+                # Operations per second over a batched insert followed by a batched search
+                elapsed = measure_time(lambda: (index.insert_many(dataset), index.search_many(dataset)))
+                throughputs.append(2 * len(dataset) / elapsed)
+
+            elapsed = measure_time(run_partitioned_in_process, dataset, num_shards, structure)
+            baseline.append(2 * len(dataset) / elapsed)
+
+    return throughput_skiplist, throughput_dsw, baseline_skiplist, baseline_dsw
+
+# Plotting the sharding results
+def plot_sharding_results(shard_counts, throughput_skiplist, throughput_dsw, baseline_skiplist, baseline_dsw):
+    if not os.path.exists('results'):
+        os.makedirs('results')
+    plt.figure(figsize=(10, 6))
+    plt.plot(shard_counts, throughput_skiplist, label="Sharded SkipList Throughput", color='blue', marker='o')
+    plt.plot(shard_counts, throughput_dsw, label="Sharded DSW Tree Throughput", color='red', marker='o')
+    plt.plot(shard_counts, baseline_skiplist, label="Partitioned SkipList, One Process", color='blue', linestyle='--')
+    plt.plot(shard_counts, baseline_dsw, label="Partitioned DSW Tree, One Process", color='red', linestyle='--')
+    plt.xlabel('Number of Shards')
+    plt.ylabel('Throughput (operations/second)')
+    plt.title(f'Sharded Index Throughput Scaling ({os.cpu_count()} CPUs)')
+    plt.legend()
+    plt.grid(True)
+    plt.savefig('results/sharding_throughput.png')
+    plt.show()
+
 # Plotting the results
 def plot_results(dataset_sizes, 
                  insert_times_skiplist, insert_times_dsw, 
@@ -272,6 +415,13 @@ def main():
     # Run the range search experiment with memory tracking
     range_search_times_skiplist, range_search_times_dsw, memory_usage_range_search_skiplist, memory_usage_range_search_dsw = run_range_search_experiment(dataset_sizes)
 
+    # Run the frozen layout experiment
+    frozen_results = run_frozen_search_experiment(dataset_sizes)
+
+    # Run the sharding experiment on the largest dataset
+    shard_counts = [1, 2, 4, 8]
+    throughput_skiplist, throughput_dsw, baseline_skiplist, baseline_dsw = run_sharding_experiment(shard_counts)
+
     # Print the results to the console
     print("Dataset Sizes:", dataset_sizes)
     print("SkipList Insert Times:", insert_times_skiplist)
@@ -290,6 +440,18 @@ def main():
     print("DSW Tree Memory Usage (Delete):", memory_usage_delete_dsw)
     print("SkipList Memory Usage (Range Search):", memory_usage_range_search_skiplist)
     print("DSW Tree Memory Usage (Range Search):", memory_usage_range_search_dsw)
+    print("Frozen Eytzinger search_many Times:", frozen_results[2])
+    print("Frozen van Emde Boas search_many Times:", frozen_results[3])
+    print("Frozen Eytzinger search Times:", frozen_results[4])
+    print("Frozen van Emde Boas search Times:", frozen_results[5])
+    print("Frozen Eytzinger Footprint:", frozen_results[8])
+    print("Frozen van Emde Boas Footprint:", frozen_results[9])
+    print("Shard Counts:", shard_counts)
+    print("Sharded SkipList Throughput:", throughput_skiplist)
+    print("Sharded DSW Tree Throughput:", throughput_dsw)
+    print("Partitioned SkipList Throughput (One Process):", baseline_skiplist)
+    print("Partitioned DSW Tree Throughput (One Process):", baseline_dsw)
+    print("CPU Count:", os.cpu_count())
 
     # Plot and save the results
     plot_results(
@@ -303,6 +465,8 @@ def main():
         memory_usage_delete_skiplist, memory_usage_delete_dsw,
         memory_usage_range_search_skiplist, memory_usage_range_search_dsw
     )
+    plot_frozen_results(dataset_sizes, *frozen_results)
+    plot_sharding_results(shard_counts, throughput_skiplist, throughput_dsw, baseline_skiplist, baseline_dsw)
 
 # Run the experiment
 if __name__ == "__main__":
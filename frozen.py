@@ -0,0 +1,203 @@
+import numpy as np
+
+# Function to list BFS indices (1-based) of a complete tree of the given height in van Emde Boas order
+def veb_order(root, height):
+    if height == 1:
+        return [root]
+    top_height = height // 2
+    bottom_height = height - top_height
+    order = veb_order(root, top_height)
+    first_bottom_root = root << top_height
+    for j in range(2 ** top_height):
+        order.extend(veb_order(first_bottom_root + j, bottom_height))
+    return order
+
+# Function to return the in-order rank of every node of a complete tree, indexed by BFS index - 1
+def inorder_ranks(height):
+    ranks = []
+    for depth in range(height):
+        first = 2 ** depth
+        offsets = np.arange(first, dtype=np.int64)
+        ranks.append(((2 * offsets + 1) << (height - 1 - depth)) - 1)
+    return np.concatenate(ranks)
+
+# Function to build the per-depth tables used to locate a node in the van Emde Boas layout.
+# A node at depth d is the root of a bottom tree of size bottom[d] hanging under a top tree
+# of size top[d] whose root sits at depth top_depth[d].
+def veb_tables(height):
+    top = np.zeros(height, dtype=np.int64)
+    bottom = np.zeros(height, dtype=np.int64)
+    top_depth = np.zeros(height, dtype=np.int64)
+
+    def split(depth, h):
+        if h == 1:
+            return
+        top_height = h // 2
+        bottom_height = h - top_height
+        d = depth + top_height
+        top[d] = 2 ** top_height - 1
+        bottom[d] = 2 ** bottom_height - 1
+        top_depth[d] = depth
+        split(depth, top_height)
+        split(d, bottom_height)
+
+    split(0, height)
+    return top, bottom, top_depth
+
+
+class FrozenIndex:
+    """Read-only snapshot of sorted keys laid out as a complete binary search tree
+    in one contiguous typed array.
+
+    layout="eytzinger" stores the tree in BFS order, layout="veb" in van Emde Boas
+    order. The tree is padded at the end of the in-order sequence with the largest
+    representable key; a result is real only when its in-order rank is below size.
+    Single-key lookups index the same array through a memoryview, which returns
+    plain Python numbers without the cost of NumPy scalars. The vEB layout also
+    keeps a typed table mapping BFS index to position, which nbytes includes.
+    """
+
+    LAYOUTS = ("eytzinger", "veb")
+
+    def __init__(self, keys, layout="eytzinger"):
+        if layout not in self.LAYOUTS:
+            raise ValueError(f"Unknown layout: {layout}")
+        keys = np.sort(np.asarray(keys))
+        if keys.dtype.kind not in "iuf":
+            raise TypeError("FrozenIndex only supports numeric keys")
+        self.layout = layout
+        self.size = len(keys)
+        self.height = max(1, self.size.bit_length())
+        capacity = 2 ** self.height - 1
+        if keys.dtype.kind == "f":
+            sentinel = np.inf
+        else:
+            sentinel = np.iinfo(keys.dtype).max
+        padded = np.full(capacity, sentinel, dtype=keys.dtype)
+        padded[:self.size] = keys
+
+        # Eytzinger order is BFS order; van Emde Boas order is a permutation of it
+        bfs_values = padded[inorder_ranks(self.height)]
+        if layout == "eytzinger":
+            self.values = bfs_values
+        else:
+            order = np.array(veb_order(1, self.height))
+            self.values = np.ascontiguousarray(bfs_values[order - 1])
+            self.top, self.bottom, self.top_depth = veb_tables(self.height)
+            # Depths whose positions later depths read back, mapped to the last depth that reads them.
+            # A batch descent keeps only these, and drops each one after its last reader.
+            self.last_reader = {}
+            for depth in range(1, self.height):
+                self.last_reader[int(self.top_depth[depth])] = depth
+            position_type = np.int32 if capacity < 2 ** 31 else np.int64
+            self.positions = np.zeros(capacity + 1, dtype=position_type)
+            self.positions[order] = np.arange(capacity, dtype=position_type)
+            self.position_view = memoryview(self.positions)
+        self.value_view = memoryview(self.values)
+
+    @property
+    def nbytes(self):
+        # Memory held by the layout's arrays: the values, plus the vEB position and split tables
+        total = self.values.nbytes
+        if self.layout == "veb":
+            total += self.positions.nbytes + self.top.nbytes + self.bottom.nbytes + self.top_depth.nbytes
+        return total
+
+    def __len__(self):
+        return self.size
+
+    def _descend(self, key):
+        # Returns (position of the smallest stored value >= key, in-order rank of that value)
+        values = self.value_view
+        index = 1
+        candidate = -1
+
+        if self.layout == "eytzinger":
+            for _ in range(self.height):
+                if key <= values[index - 1]:
+                    candidate = index - 1
+                    index = 2 * index
+                else:
+                    index = 2 * index + 1
+            return candidate, index - 2 ** self.height
+
+        position_of = self.position_view
+        for _ in range(self.height):
+            position = position_of[index]
+            if key <= values[position]:
+                candidate = position
+                index = 2 * index
+            else:
+                index = 2 * index + 1
+        return candidate, index - 2 ** self.height
+
+    def _descend_many(self, keys):
+        values = self.values
+        count = len(keys)
+        index = np.ones(count, dtype=np.int64)
+        candidate = np.full(count, -1, dtype=np.int64)
+        saved = {}
+        for depth in range(self.height):
+            if self.layout == "eytzinger":
+                position = index - 1
+            elif depth == 0:
+                position = np.zeros(count, dtype=np.int64)
+            else:
+                top = self.top[depth]
+                top_depth = int(self.top_depth[depth])
+                position = saved[top_depth] + top + (index & top) * self.bottom[depth]
+                if self.last_reader[top_depth] == depth:
+                    del saved[top_depth]
+            if self.layout == "veb" and depth in self.last_reader:
+                saved[depth] = position
+            go_left = keys <= values[position]
+            candidate = np.where(go_left, position, candidate)
+            index = 2 * index + ~go_left
+        return candidate, index - 2 ** self.height
+
+    def lower_bound(self, key):
+        """Return the smallest key >= key, or None if every key is smaller."""
+        candidate, rank = self._descend(key)
+        if rank >= self.size:
+            return None
+        return self.value_view[candidate]
+
+    def search(self, key):
+        """Return key if it is stored, otherwise None."""
+        candidate, rank = self._descend(key)
+        if rank >= self.size or self.value_view[candidate] != key:
+            return None
+        return self.value_view[candidate]
+
+    def lower_bound_many(self, keys):
+        """Vectorized lower_bound: returns (values, valid) where valid marks queries
+        that have a lower bound."""
+        keys = np.asarray(keys)
+        candidate, rank = self._descend_many(keys)
+        valid = rank < self.size
+        return self.values[candidate], valid
+
+    def search_many(self, keys):
+        """Vectorized search: returns a boolean array marking which keys are stored."""
+        keys = np.asarray(keys)
+        found, valid = self.lower_bound_many(keys)
+        return valid & (found == keys)
+
+    def to_list(self):
+        """Return the stored keys in sorted order."""
+        bfs_values = self.values
+        if self.layout == "veb":
+            bfs_values = self.values[self.positions[1:]]
+        ordered = np.empty_like(bfs_values)
+        ordered[inorder_ranks(self.height)] = bfs_values
+        return ordered[:self.size].tolist()
+
+
+# Example usage
+if __name__ == "__main__":
+    for layout in FrozenIndex.LAYOUTS:
+        frozen = FrozenIndex([3, 6, 7, 9, 12, 19, 17, 26, 21], layout=layout)
+        print(f"{layout} layout:", frozen.values.tolist())
+        print("Searching for 19:", "Found" if frozen.search(19) is not None else "Not Found")
+        print("Lower bound of 10:", frozen.lower_bound(10))
+        print("Search many [6, 8, 26]:", frozen.search_many([6, 8, 26]).tolist())
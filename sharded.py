@@ -0,0 +1,299 @@
+import heapq
+import multiprocessing as mp
+from bisect import bisect_left, bisect_right
+from skiplist import SkipList
+from dsw import BinaryTree
+
+# Function to build an empty structure of the requested kind
+def make_structure(structure):
+    if structure == "skiplist":
+        return SkipList(max_level=4, p=0.5)
+    if structure == "dsw":
+        return BinaryTree()
+    raise ValueError(f"Unknown structure: {structure}")
+
+# Function to split key_range into num_shards equal ranges; returns the inner boundaries
+def initial_boundaries(num_shards, key_range):
+    low, high = key_range
+    step = (high - low + 1) / num_shards
+    return [low + int(step * i) for i in range(1, num_shards)]
+
+# Function to order sorted keys middle-first so a plain BST insert stays shallow
+def balanced_order(keys):
+    order = []
+    stack = [(0, len(keys))]
+    while stack:
+        low, high = stack.pop()
+        if low >= high:
+            continue
+        mid = (low + high) // 2
+        order.append(keys[mid])
+        stack.append((mid + 1, high))
+        stack.append((low, mid))
+    return order
+
+# Function to return the key of a node found by the given structure
+def node_key(node, structure):
+    if node is None:
+        return None
+    if structure == "skiplist":
+        return node.key
+    if structure == "dsw":
+        return node.value
+    raise ValueError(f"Unknown structure: {structure}")
+
+# Function to apply one command to a shard's structure; returns (structure, reply)
+def handle_command(index, structure, op, args):
+    if op == "insert":
+        index.insert(args)
+        return index, None
+    if op == "insert_many":
+        if structure == "dsw":
+            # Middle-first keeps a sorted batch from growing a chain, and DSW rebalances afterwards
+            args = balanced_order(sorted(args))
+        inserted = 0
+        try:
+            for key in args:
+                index.insert(key)
+                inserted += 1
+        except Exception as exc:
+            exc.inserted = inserted  # Lets the front-end keep its shard sizes exact
+            raise
+        if structure == "dsw":
+            index.create_backbone()
+            index.balance_tree()
+        return index, None
+    if op == "search":
+        return index, node_key(index.search(args), structure)
+    if op == "search_many":
+        return index, [node_key(index.search(key), structure) for key in args]
+    if op == "delete":
+        found = index.search(args) is not None
+        if found:
+            index.delete(args)
+        return index, found
+    if op == "range_search":
+        # BinaryTree returns keys in pre-order, so sort before merging
+        return index, sorted(index.range_search(*args))
+    if op == "load":
+        index = make_structure(structure)
+        for key in balanced_order(args):
+            index.insert(key)
+        return index, None
+    raise ValueError(f"Unknown operation: {op}")
+
+# Worker loop: owns one structure and serves commands sent over the pipe
+def shard_worker(conn, structure):
+    index = make_structure(structure)
+    while True:
+        op, args = conn.recv()
+        if op == "close":
+            conn.close()
+            return
+        try:
+            index, reply = handle_command(index, structure, op, args)
+        except Exception as exc:
+            reply = exc
+        conn.send(reply)
+
+
+class ShardedIndex:
+    """Ordered index whose key space is split into ranges, one worker process per range.
+
+    Shard i owns keys in [boundaries[i-1], boundaries[i]); the first and last
+    shards are open-ended. Per-shard sizes are tracked here so rebalancing can
+    be decided without a round-trip to the workers.
+    """
+
+    # Automatic rebalancing waits until the index has grown by this fraction since the last attempt
+    REBALANCE_GROWTH = 0.5
+
+    def __init__(self, num_shards, structure="skiplist", key_range=(1, 10000), rebalance_threshold=None):
+        if num_shards < 1:
+            raise ValueError("num_shards must be at least 1")
+        self.num_shards = num_shards
+        self.structure = structure
+        self.rebalance_threshold = rebalance_threshold
+        self.boundaries = initial_boundaries(num_shards, key_range)
+        self.sizes = [0] * num_shards
+        self.last_rebalance_size = 0
+        self.connections = []
+        self.workers = []
+        make_structure(structure)  # Fail fast on an unknown structure name
+        for _ in range(num_shards):
+            parent_conn, child_conn = mp.Pipe()
+            worker = mp.Process(target=shard_worker, args=(child_conn, structure), daemon=True)
+            worker.start()
+            child_conn.close()
+            self.connections.append(parent_conn)
+            self.workers.append(worker)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+    def shard_for(self, key):
+        return bisect_right(self.boundaries, key)
+
+    def _call(self, shard, op, args=None):
+        self.connections[shard].send((op, args))
+        return self._receive(shard)
+
+    def _receive(self, shard):
+        result = self.connections[shard].recv()
+        if isinstance(result, Exception):
+            raise result
+        return result
+
+    def _gather(self, shards):
+        # Read every outstanding reply before raising so no pipe is left holding a stale answer
+        return [self.connections[shard].recv() for shard in shards]
+
+    def _raise_first_error(self, replies):
+        for reply in replies:
+            if isinstance(reply, Exception):
+                raise reply
+
+    def _scatter(self, keys):
+        batches = [[] for _ in range(self.num_shards)]
+        positions = [[] for _ in range(self.num_shards)]
+        for position, key in enumerate(keys):
+            shard = self.shard_for(key)
+            batches[shard].append(key)
+            positions[shard].append(position)
+        return batches, positions
+
+    def insert(self, key):
+        shard = self.shard_for(key)
+        self._call(shard, "insert", key)
+        self.sizes[shard] += 1
+        self._maybe_rebalance()
+
+    def insert_many(self, keys):
+        # Send every batch before waiting so the shards insert in parallel
+        batches, _ = self._scatter(keys)
+        busy = [shard for shard, batch in enumerate(batches) if batch]
+        for shard in busy:
+            self.connections[shard].send(("insert_many", batches[shard]))
+        replies = self._gather(busy)
+        for shard, reply in zip(busy, replies):
+            if isinstance(reply, Exception):
+                self.sizes[shard] += getattr(reply, "inserted", 0)
+            else:
+                self.sizes[shard] += len(batches[shard])
+        self._raise_first_error(replies)
+        self._maybe_rebalance()
+
+    def search(self, key):
+        return self._call(self.shard_for(key), "search", key)
+
+    def search_many(self, keys):
+        batches, positions = self._scatter(keys)
+        busy = [shard for shard, batch in enumerate(batches) if batch]
+        for shard in busy:
+            self.connections[shard].send(("search_many", batches[shard]))
+        replies = self._gather(busy)
+        self._raise_first_error(replies)
+        results = [None] * len(keys)
+        for shard, reply in zip(busy, replies):
+            for position, found in zip(positions[shard], reply):
+                results[position] = found
+        return results
+
+    def delete(self, key):
+        shard = self.shard_for(key)
+        if self._call(shard, "delete", key):
+            self.sizes[shard] -= 1
+
+    def range_search(self, low, high):
+        first, last = self.shard_for(low), self.shard_for(high)
+        shards = range(first, last + 1)
+        for shard in shards:
+            self.connections[shard].send(("range_search", (low, high)))
+        streams = self._gather(shards)
+        self._raise_first_error(streams)
+        return list(heapq.merge(*streams))
+
+    def size(self):
+        return sum(self.sizes)
+
+    def _maybe_rebalance(self):
+        if self.rebalance_threshold is None:
+            return
+        if self.size() < self.last_rebalance_size * (1 + self.REBALANCE_GROWTH):
+            return
+        self.rebalance(self.rebalance_threshold)
+
+    def rebalance(self, threshold=2.0):
+        """Move shard boundaries to key quantiles when the largest shard exceeds
+        threshold times the smallest one (an empty shard counts as size 1).
+        Returns True if shards were rebuilt; False when the sizes are not skewed or
+        the quantile boundaries would not shrink the largest shard, e.g. when most
+        keys are duplicates."""
+        total = self.size()
+        if self.num_shards == 1 or total == 0:
+            return False
+        if max(self.sizes) <= threshold * max(min(self.sizes), 1):
+            return False
+
+        shards = range(self.num_shards)
+        for shard in shards:
+            self.connections[shard].send(("range_search", (float("-inf"), float("inf"))))
+        streams = self._gather(shards)
+        self._raise_first_error(streams)
+        keys = list(heapq.merge(*streams))
+        self.last_rebalance_size = total
+
+        # Keys equal to a boundary belong to the shard on its right
+        boundaries = [keys[i * len(keys) // self.num_shards] for i in range(1, self.num_shards)]
+        cuts = [0] + [bisect_left(keys, boundary) for boundary in boundaries] + [len(keys)]
+        batches = [keys[cuts[shard]:cuts[shard + 1]] for shard in shards]
+        if boundaries == self.boundaries or max(map(len, batches)) >= max(self.sizes):
+            return False
+
+        replies = self._load(shards, batches)
+        failed = [isinstance(reply, Exception) for reply in replies]
+        if any(failed):
+            # A failed load leaves that shard's old structure in place, so put the old
+            # contents back everywhere else and keep the old boundaries
+            restored = [shard for shard in shards if not failed[shard]]
+            self._raise_first_error(self._load(restored, [streams[shard] for shard in restored]))
+            self._raise_first_error(replies)
+
+        self.boundaries = boundaries
+        self.sizes = [len(batch) for batch in batches]
+        return True
+
+    def _load(self, shards, batches):
+        for shard, batch in zip(shards, batches):
+            self.connections[shard].send(("load", batch))
+        return self._gather(shards)
+
+    def close(self):
+        for conn in self.connections:
+            try:
+                conn.send(("close", None))
+                conn.close()
+            except (OSError, BrokenPipeError):
+                pass
+        for worker in self.workers:
+            worker.join()
+        self.connections = []
+        self.workers = []
+
+
+# Example usage
+if __name__ == "__main__":
+    with ShardedIndex(num_shards=4, structure="skiplist", key_range=(1, 100)) as index:
+        index.insert_many([3, 6, 7, 9, 12, 19, 17, 26, 21, 55, 80, 91])
+        print("Shard sizes:", index.sizes)
+        print("Searching for 19:", "Found" if index.search(19) is not None else "Not Found")
+        index.delete(19)
+        print("Range search [6, 60]:", index.range_search(6, 60))
+
+        index.insert_many(range(30, 50))
+        print("Shard sizes before rebalance:", index.sizes, "boundaries:", index.boundaries)
+        index.rebalance()
+        print("Shard sizes after rebalance:", index.sizes, "boundaries:", index.boundaries)
@@ -1,6 +1,7 @@
 import random
 import numpy as np
 from graphviz import Digraph
+from frozen import FrozenIndex
 
 class Node:
     def __init__(self, key, level):
@@ -13,6 +14,7 @@ class SkipList:
         self.p = p
         self.header = Node(-1, max_level)
         self.level = 0
+        self.frozen = None  # Cached FrozenIndex, dropped on the next write
 
     def random_level(self):
         lvl = 0
@@ -21,6 +23,7 @@ class SkipList:
         return lvl
 
     def insert(self, key, visualize=False):
+        self.frozen = None
         update = np.array([None] * (self.max_level + 1), dtype=object)
         current = self.header
 
@@ -57,6 +60,7 @@ class SkipList:
         return None
 
     def delete(self, key, visualize=False):
+        self.frozen = None
         update = np.array([None] * (self.max_level + 1), dtype=object)
         current = self.header
 
@@ -95,6 +99,20 @@ class SkipList:
 
         return results
 
+    def keys(self):
+        keys = []
+        current = self.header.forward[0]
+        while current:
+            keys.append(current.key)
+            current = current.forward[0]
+        return keys
+
+    def freeze(self, layout="eytzinger"):
+        # Read-only array layout of level 0 for lookup-heavy phases; rebuilt after any insert or delete
+        if self.frozen is None or self.frozen.layout != layout:
+            self.frozen = FrozenIndex(self.keys(), layout=layout)
+        return self.frozen
+
     def display(self):
         print("\nSkip List:")
         for i in range(self.level + 1):
@@ -137,3 +155,7 @@ if __name__ == "__main__":
     skiplist.display()
 
     print("\nRange search [6, 21]:", skiplist.range_search(6, 21))
+
+    frozen = skiplist.freeze(layout="veb")
+    print("\nFrozen van Emde Boas layout:", frozen.values.tolist())
+    print("Search many [6, 19, 26]:", frozen.search_many([6, 19, 26]).tolist())